@@ -33,6 +33,7 @@ def health_check():
 def read_root():
     return {"message": "Welcome to RealK API. Visit /api/docs for documentation."}
 
-from api.v1.endpoints import chart
+from api.v1.endpoints import chart, profiles
 app.include_router(chart.router, prefix="/api/v1", tags=["chart"])
+app.include_router(profiles.router, prefix="/api/v1/admin", tags=["admin"])
 
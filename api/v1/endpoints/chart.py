@@ -2,10 +2,45 @@ from fastapi import APIRouter, HTTPException, Query
 from core.data_loader import fetch_stock_data, fetch_exchange_rate, fetch_cpi_data, fetch_gold_data
 from core.calculator import calculate_real_price
 from api.v1.models import ChartResponse, ChartDataPoint
+from api.v1.profiling import ProfiledRoute
+from core.profiler import profile_stage
 import pandas as pd
 from typing import Optional
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
+
+def build_chart_response(result_df: pd.DataFrame, ticker: str, company_name: Optional[str], benchmark: str, period: str) -> ChartResponse:
+    """
+    Convert the calculated DataFrame into the API response model.
+    """
+    data_points = []
+    overall_alpha = 0
+    
+    if 'Alpha' in result_df and not result_df['Alpha'].empty:
+        overall_alpha = result_df['Alpha'].iloc[-1]
+
+    for index, row in result_df.iterrows():
+        data_points.append(ChartDataPoint(
+            date=index.strftime('%Y-%m-%d'),
+            close=format(row['Close_KRW'], ".0f"), # Nominal KRW
+            real_price_usd=row['Close_USD'] if pd.notna(row['Close_USD']) else None,
+            real_price_cpi=row['Real_Price'] if pd.notna(row['Real_Price']) else None,
+            gold_price_don=row['Close_Gold_don'] if 'Close_Gold_don' in row and pd.notna(row['Close_Gold_don']) else None,
+            gold_price_oz=row['Close_Gold_oz'] if 'Close_Gold_oz' in row and pd.notna(row['Close_Gold_oz']) else None,
+            gold_base_price=row['Gold_USD_oz'] if 'Gold_USD_oz' in row and pd.notna(row['Gold_USD_oz']) else None,
+            benchmark_real_price=row['Benchmark_Real_Price'] if 'Benchmark_Real_Price' in row and pd.notna(row['Benchmark_Real_Price']) else None,
+            alpha=row['Alpha'] if 'Alpha' in row and pd.notna(row['Alpha']) else None
+        ) )
+        
+    return ChartResponse(
+        ticker=ticker,
+        company_name=company_name,
+        benchmark_name=benchmark,
+        period=period,
+        data=data_points,
+        overall_alpha=float(overall_alpha) if pd.notna(overall_alpha) else 0
+    )
+
 
 @router.get("/chart/{ticker}", response_model=ChartResponse)
 async def get_chart_data(
@@ -23,23 +58,24 @@ async def get_chart_data(
         company_name = None
         
         # Check if ticker is a name (non-numeric)
-        if not ticker.replace('.KS', '').replace('.KQ', '').isdigit():
-            # Attempt to resolve name
-            from core.stock_search import get_ticker_from_name
-            resolved_code, resolved_name = get_ticker_from_name(ticker)
-            if resolved_code:
-                # Update ticker
-                print(f"Resolved '{ticker}' to code '{resolved_code}' ({resolved_name})")
-                ticker = resolved_code
-                company_name = resolved_name
+        with profile_stage("resolve_ticker"):
+            if not ticker.replace('.KS', '').replace('.KQ', '').isdigit():
+                # Attempt to resolve name
+                from core.stock_search import get_ticker_from_name
+                resolved_code, resolved_name = get_ticker_from_name(ticker)
+                if resolved_code:
+                    # Update ticker
+                    print(f"Resolved '{ticker}' to code '{resolved_code}' ({resolved_name})")
+                    ticker = resolved_code
+                    company_name = resolved_name
+                else:
+                    # If resolution failed, maybe it's US stock or symbol?
+                    # Just proceed, yfinance might handle it or fail.
+                    pass
             else:
-                # If resolution failed, maybe it's US stock or symbol?
-                # Just proceed, yfinance might handle it or fail.
-                pass
-        else:
-            # If ticker is numeric (e.g. 005930), try to find its name
-            from core.stock_search import get_name_from_ticker
-            company_name = get_name_from_ticker(ticker)
+                # If ticker is numeric (e.g. 005930), try to find its name
+                from core.stock_search import get_name_from_ticker
+                company_name = get_name_from_ticker(ticker)
 
         # Map common benchmark aliases if needed
         benchmark_map = {
@@ -59,7 +95,8 @@ async def get_chart_data(
         exchange_task = fetch_exchange_rate(period, start_date, end_date)
         
         # Concurrent execution for essentials
-        stock_df, exchange_df = await asyncio.gather(stock_task, exchange_task)
+        with profile_stage("fetch_essential", awaits=True):
+            stock_df, exchange_df = await asyncio.gather(stock_task, exchange_task)
         
         if stock_df.empty:
             raise HTTPException(status_code=404, detail=f"No data found for ticker {ticker}")
@@ -79,43 +116,20 @@ async def get_chart_data(
                 print(f"Warning: Optional task '{name}' failed or timed out: {e}")
                 return fallback_val
 
-        cpi_series, gold_df, benchmark_df = await asyncio.gather(
-            run_optional(cpi_task, _get_mock_cpi_data(), "CPI"),
-            run_optional(gold_task, pd.DataFrame(), "GOLD"),
-            run_optional(benchmark_task, pd.DataFrame(), "BENCHMARK")
-        )
+        with profile_stage("fetch_optional", awaits=True):
+            cpi_series, gold_df, benchmark_df = await asyncio.gather(
+                run_optional(cpi_task, _get_mock_cpi_data(), "CPI"),
+                run_optional(gold_task, pd.DataFrame(), "GOLD"),
+                run_optional(benchmark_task, pd.DataFrame(), "BENCHMARK")
+            )
             
         # 2. Calculate
-        result_df = calculate_real_price(stock_df, exchange_df, cpi_series, gold_df, benchmark_df)
+        with profile_stage("calculate"):
+            result_df = calculate_real_price(stock_df, exchange_df, cpi_series, gold_df, benchmark_df)
         
         # 3. Format Response
-        data_points = []
-        overall_alpha = 0
-        
-        if 'Alpha' in result_df and not result_df['Alpha'].empty:
-            overall_alpha = result_df['Alpha'].iloc[-1]
-
-        for index, row in result_df.iterrows():
-            data_points.append(ChartDataPoint(
-                date=index.strftime('%Y-%m-%d'),
-                close=format(row['Close_KRW'], ".0f"), # Nominal KRW
-                real_price_usd=row['Close_USD'] if pd.notna(row['Close_USD']) else None,
-                real_price_cpi=row['Real_Price'] if pd.notna(row['Real_Price']) else None,
-                gold_price_don=row['Close_Gold_don'] if 'Close_Gold_don' in row and pd.notna(row['Close_Gold_don']) else None,
-                gold_price_oz=row['Close_Gold_oz'] if 'Close_Gold_oz' in row and pd.notna(row['Close_Gold_oz']) else None,
-                gold_base_price=row['Gold_USD_oz'] if 'Gold_USD_oz' in row and pd.notna(row['Gold_USD_oz']) else None,
-                benchmark_real_price=row['Benchmark_Real_Price'] if 'Benchmark_Real_Price' in row and pd.notna(row['Benchmark_Real_Price']) else None,
-                alpha=row['Alpha'] if 'Alpha' in row and pd.notna(row['Alpha']) else None
-            ) )
-            
-        return ChartResponse(
-            ticker=ticker,
-            company_name=company_name,
-            benchmark_name=benchmark,
-            period=period,
-            data=data_points,
-            overall_alpha=float(overall_alpha) if pd.notna(overall_alpha) else 0
-        )
+        with profile_stage("format"):
+            return build_chart_response(result_df, ticker, company_name, benchmark, period)
         
     except Exception as e:
         print(f"Error processing request: {e}")
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from typing import Optional
+
+from core.config import settings
+from core.profiler import is_admin_token, trace_store
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Admin routes are hidden unless PROFILE_ADMIN_TOKEN is configured.
+    """
+    if not settings.PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+@router.get("/profiles")
+def list_profiles():
+    """
+    List stored request profiles, newest first.
+    """
+    return {"max_traces": trace_store.max_traces, "profiles": trace_store.list()}
+
+@router.get("/profiles/{trace_id}")
+def get_profile(trace_id: str):
+    """
+    Get one profile summary: per-stage timings/allocations and the top functions by own time.
+    """
+    summary = trace_store.get(trace_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"No profile {trace_id}")
+    return summary
+
+@router.get("/profiles/{trace_id}/download")
+def download_profile(trace_id: str):
+    """
+    Download the raw cProfile trace (pstats format, e.g. `python -m pstats` or snakeviz).
+    """
+    path = trace_store.prof_path(trace_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No profile {trace_id}")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{trace_id}.prof")
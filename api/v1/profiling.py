@@ -0,0 +1,71 @@
+import asyncio
+import functools
+from typing import Any, Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+
+from core.profiler import current_profile, profiling_trigger, start_profile, finish_profile, trace_store
+
+
+def _serialize_after(endpoint: Callable) -> Callable:
+    """
+    Open a 'serialize' stage when the endpoint returns. It stays open while FastAPI validates
+    and serializes the response for response_model, and is closed by finish_profile().
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        profile = current_profile()
+        if profile is not None:
+            profile.begin_stage("serialize")
+        return result
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route class that profiles opted-in requests (admin header or sampling, see core.profiler).
+    Requests that are not profiled pay only for the trigger check and a ContextVar lookup.
+    Only async endpoints are supported.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, _serialize_after(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        original_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            trigger = profiling_trigger(request.headers)
+            if trigger is None:
+                return await original_handler(request)
+
+            profile = start_profile(trigger, request.url.path, request.url.query)
+            if profile is None:
+                return await original_handler(request)
+
+            status_code = 500
+            try:
+                response = await original_handler(request)
+                status_code = response.status_code
+                response.headers["X-Profile-Id"] = profile.id
+                return response
+            except HTTPException as e:
+                status_code = e.status_code
+                # The trace is saved for failed requests too; hand its id back with the error
+                e.headers = {**(e.headers or {}), "X-Profile-Id": profile.id}
+                raise
+            except RequestValidationError:
+                status_code = 422
+                raise
+            finally:
+                summary = finish_profile(profile, status_code)
+                try:
+                    loop = asyncio.get_event_loop()
+                    await loop.run_in_executor(None, trace_store.save, profile, summary)
+                except Exception as e:
+                    print(f"Warning: Failed to save profile trace {profile.id}: {e}")
+
+        return route_handler
@@ -0,0 +1 @@
+# Offline benchmark & load-test suite (see "Benchmarks" in README.md)
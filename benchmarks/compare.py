@@ -0,0 +1,90 @@
+"""
+Compare two benchmark result files produced by benchmarks/run.py.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.15
+
+Micro-benchmarks are compared on median time, the load test on p95 latency and throughput.
+Exits with status 1 if anything regressed by more than the threshold (default 15%), or if a
+metric exists in only one of the files (a renamed benchmark, or a run with --skip-load).
+"""
+import argparse
+import json
+import math
+import sys
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _metrics(results: dict) -> dict:
+    """Flatten one result file into {label: (value, lower_is_better)}."""
+    metrics = {}
+    for m in results.get("micro") or []:
+        label = f"{m['name']}[{m['period']}]" if m["period"] else m["name"]
+        metrics[label + " median_ms"] = (m["median_ms"], True)
+    load = results.get("load")
+    if load:
+        metrics["load p95_ms"] = (load["latency"]["p95_ms"], True)
+        # Lower throughput is the regression here
+        metrics["load throughput_rps"] = (load["throughput_rps"], False)
+    return metrics
+
+
+def _change(old: float, new: float) -> float:
+    if old:
+        return new / old - 1
+    return 0.0 if not new else math.inf
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Return one row per metric: (name, baseline, current, change ratio, regressed).
+    A metric present in only one file has None for the other side and change, and counts as
+    regressed, so renaming a benchmark or skipping the load test cannot pass the gate silently.
+    """
+    base, cur = _metrics(baseline), _metrics(current)
+    rows = []
+    for name in list(base) + [n for n in cur if n not in base]:
+        if name not in base or name not in cur:
+            old, new = base.get(name, (None,))[0], cur.get(name, (None,))[0]
+            rows.append((name, old, new, None, True))
+            continue
+        (old, lower_is_better), (new, _) = base[name], cur[name]
+        change = _change(old, new)
+        regressed = change > threshold if lower_is_better else -change > threshold
+        rows.append((name, old, new, change, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative slowdown (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    if baseline.get("meta", {}).get("fixtures") != current.get("meta", {}).get("fixtures"):
+        print("Warning: results were produced from different fixtures; numbers may not be comparable.")
+
+    rows = compare(baseline, current, args.threshold)
+    width = max((len(r[0]) for r in rows), default=10)
+    for name, old, new, change, regressed in rows:
+        if change is None:
+            side = "current" if new is None else "baseline"
+            print(f"{name:<{width}}  {'':>12}  {'':>12}  {'':>8}  MISSING from {side}")
+            continue
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<{width}}  {old:>12.3f}  {new:>12.3f}  {change:>+8.1%}{flag}")
+
+    missing = [r for r in rows if r[3] is None]
+    regressions = [r for r in rows if r[4] and r[3] is not None]
+    print(f"\n{len(rows) - len(missing)} metrics compared, {len(regressions)} regressed beyond "
+          f"{args.threshold:.0%}, {len(missing)} missing from one side.")
+    sys.exit(1 if regressions or missing else 0)
+
+
+if __name__ == "__main__":
+    main()
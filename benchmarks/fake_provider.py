@@ -0,0 +1,131 @@
+"""
+Local fake for every upstream the backend talks to, served from recorded fixtures
+(benchmarks/fixtures) or the on-demand synthetic set (see benchmarks/record_fixtures.py).
+
+`installed()` swaps the provider clients used by core.data_loader and core.stock_search
+(yfinance, fredapi, the KOSIS httpx client, FinanceDataReader) for fixture-backed fakes,
+so the real loader / calculator / endpoint code runs unchanged with no network.
+"""
+import json
+import os
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+import pandas as pd
+
+from benchmarks.record_fixtures import ensure_fixtures
+
+# yfinance period strings -> how far back from the last fixture date to slice
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+PERIOD_ROWS = {"1d": 1, "5d": 5}
+
+
+class FixtureProvider:
+    """Loads the recorded fixtures once and answers provider-shaped queries from them."""
+
+    def __init__(self, fixtures_dir: str = None):
+        fixtures_dir = fixtures_dir or ensure_fixtures()
+        with open(os.path.join(fixtures_dir, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.source = self.manifest["source"]
+
+        self.histories = {}
+        for symbol, entry in self.manifest["yahoo"].items():
+            df = pd.read_csv(os.path.join(fixtures_dir, entry["file"]), index_col="Date", parse_dates=["Date"])
+            df.index = df.index.tz_localize(entry["tz"])
+            self.histories[symbol] = df
+
+        cpi = pd.read_csv(os.path.join(fixtures_dir, self.manifest["fred"]["CPIAUCSL"]), index_col="Date", parse_dates=["Date"])
+        self.cpi = cpi["Value"].rename(None)
+        self.cpi.index.name = None
+
+        with open(os.path.join(fixtures_dir, self.manifest["kosis"]["DT_1J20003"]), encoding="utf-8") as f:
+            self.kosis = json.load(f)
+
+        self.listing = pd.read_csv(os.path.join(fixtures_dir, self.manifest["krx"]["listing"]), dtype={"Code": str})
+
+    def history(self, symbol: str, period: str = "1mo", start: str = None, end: str = None) -> pd.DataFrame:
+        """Same contract as yfinance.Ticker.history: empty frame for unknown symbols, `end` exclusive."""
+        df = self.histories.get(symbol)
+        if df is None:
+            return pd.DataFrame()
+
+        if start:
+            tz = df.index.tz
+            mask = df.index >= pd.Timestamp(start).tz_localize(tz)
+            if end:
+                mask &= df.index < pd.Timestamp(end).tz_localize(tz)
+            return df[mask].copy()
+
+        if period == "max":
+            return df.copy()
+        if period in PERIOD_ROWS:
+            return df.iloc[-PERIOD_ROWS[period]:].copy()
+        last = df.index[-1]
+        if period == "ytd":
+            cutoff = last.normalize().replace(month=1, day=1)
+        elif period in PERIOD_OFFSETS:
+            cutoff = last.normalize() - PERIOD_OFFSETS[period]
+        else:
+            print(f"{symbol}: Period '{period}' is invalid")
+            return pd.DataFrame()
+        return df[df.index >= cutoff].copy()
+
+    def kosis_handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("tblId") == "DT_1J20003":
+            return httpx.Response(200, json=self.kosis)
+        return httpx.Response(200, json={"err": "21", "errMsg": "요청변수값이 잘못되었습니다."})
+
+
+class _FakeTicker:
+    def __init__(self, provider: FixtureProvider, symbol: str):
+        self._provider = provider
+        self.ticker = symbol
+
+    def history(self, period: str = "1mo", start: str = None, end: str = None, **kwargs) -> pd.DataFrame:
+        return self._provider.history(self.ticker, period, start, end)
+
+
+class _FakeFred:
+    def __init__(self, provider: FixtureProvider):
+        self._provider = provider
+
+    def get_series(self, series_id: str, **kwargs) -> pd.Series:
+        if series_id != "CPIAUCSL":
+            raise ValueError(f"Bad Request.  The series does not exist. ({series_id})")
+        return self._provider.cpi.copy()
+
+
+@contextmanager
+def installed(provider: FixtureProvider = None):
+    """Route all upstream calls made by core.* to `provider` for the duration of the block."""
+    import core.data_loader
+    import core.stock_search
+    from core.config import settings
+
+    provider = provider or FixtureProvider()
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.object(core.data_loader, "yf", SimpleNamespace(Ticker=partial(_FakeTicker, provider))))
+        stack.enter_context(mock.patch.object(core.data_loader, "fred", _FakeFred(provider)))
+        stack.enter_context(mock.patch.object(
+            core.data_loader, "httpx",
+            SimpleNamespace(Client=partial(httpx.Client, transport=httpx.MockTransport(provider.kosis_handler))),
+        ))
+        stack.enter_context(mock.patch.object(settings, "FRED_API_KEY", "fixture"))
+        stack.enter_context(mock.patch.object(settings, "KOSIS_API_KEY", "fixture"))
+        stack.enter_context(mock.patch.object(
+            core.stock_search, "fdr", SimpleNamespace(StockListing=lambda market: provider.listing.copy()),
+        ))
+        stack.enter_context(mock.patch.object(core.stock_search, "stocks_listing_cache", None))
+        yield provider
@@ -0,0 +1,330 @@
+"""
+Record upstream data into benchmarks/fixtures so the benchmarks can run offline.
+
+    python -m benchmarks.record_fixtures              # record from Yahoo / FRED / KOSIS / KRX (network + API keys)
+    python -m benchmarks.record_fixtures --synthetic  # deterministic synthetic data, no network, stdlib only
+
+Recorded fixtures are used when benchmarks/fixtures/manifest.json exists. Otherwise `ensure_fixtures()`
+generates the synthetic set on demand into benchmarks/.synthetic_fixtures (git-ignored).
+
+Both modes write the same file layout, described by manifest.json:
+    yahoo/<symbol>.csv.gz   Date,Open,High,Low,Close,Volume (timezone-naive dates)
+    fred/CPIAUCSL.csv       Date,Value (monthly)
+    kosis/DT_1J20003.json   raw KOSIS statisticsParameterData.do JSON
+    krx/listing.csv.gz      Code,Name,Market,Marcap
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import os
+import random
+from datetime import date, datetime, timedelta, timezone
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SYNTHETIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".synthetic_fixtures")
+# Bump when the synthetic generator changes so cached sets are regenerated
+SYNTHETIC_VERSION = 1
+
+# Symbols needed by the chart endpoint: stocks, USD/KRW, gold and benchmarks.
+# tz mirrors what yfinance attaches to history() so the calculator's tz handling is exercised.
+# market picks the synthetic holiday calendar, so the stock/FX inner merge and the gold/benchmark
+# ffill see the same kind of mismatched trading days as real data.
+YAHOO_SYMBOLS = {
+    "005930.KS": {"tz": "Asia/Seoul", "market": "KR", "start": 6000.0, "end": 55000.0, "vol": 0.020},
+    "000660.KS": {"tz": "Asia/Seoul", "market": "KR", "start": 18000.0, "end": 180000.0, "vol": 0.028},
+    "KRW=X": {"tz": "Europe/London", "market": "FX", "start": 1130.0, "end": 1380.0, "vol": 0.005},
+    "GC=F": {"tz": "America/New_York", "market": "US", "start": 285.0, "end": 2600.0, "vol": 0.011},
+    "^KS11": {"tz": "Asia/Seoul", "market": "KR", "start": 1000.0, "end": 2500.0, "vol": 0.015},
+    "^GSPC": {"tz": "America/New_York", "market": "US", "start": 1450.0, "end": 5800.0, "vol": 0.012},
+}
+
+SYNTHETIC_START = date(2000, 1, 3)
+SYNTHETIC_END = date(2025, 12, 31)
+SYNTHETIC_CPI_END = date(2025, 11, 1)  # CPI is published with a one-month lag
+
+# Real large caps so name search hits known entries; the rest of the listing is filler.
+KRX_KNOWN = [
+    ("005930", "삼성전자"), ("000660", "SK하이닉스"), ("373220", "LG에너지솔루션"),
+    ("207940", "삼성바이오로직스"), ("005380", "현대차"), ("000270", "기아"),
+    ("068270", "셀트리온"), ("035420", "NAVER"), ("035720", "카카오"),
+    ("051910", "LG화학"), ("005490", "POSCO홀딩스"), ("006400", "삼성SDI"),
+    ("028260", "삼성물산"), ("012330", "현대모비스"), ("105560", "KB금융"),
+    ("055550", "신한지주"),
+]
+KRX_LISTING_SIZE = 2400
+
+
+def _write_csv(path: str, header: list, rows: list, compress: bool):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as raw:
+        # mtime=0 keeps the gzip output byte-identical between runs
+        binary = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) if compress else raw
+        with io.TextIOWrapper(binary, encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+def _business_days(start: date, end: date, holidays: set = frozenset()):
+    d = start
+    while d <= end:
+        if d.weekday() < 5 and d not in holidays:
+            yield d
+        d += timedelta(days=1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday of a month (n=-1 for the last one)."""
+    if n > 0:
+        d = date(year, month, 1)
+        d += timedelta(days=(weekday - d.weekday()) % 7 + 7 * (n - 1))
+        return d
+    d = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month = (h + l - 7 * m + 90) // 25
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+def _holidays(market: str, start_year: int, end_year: int) -> set:
+    """
+    Approximate exchange holiday calendars. The lunar holidays (Seollal, Chuseok) are placed
+    on a deterministic pseudo-random date inside their real window rather than computed exactly.
+    """
+    days = set()
+    for year in range(start_year, end_year + 1):
+        if market == "KR":
+            lunar = random.Random(year)
+            seollal = date(year, 1, 21) + timedelta(days=lunar.randint(0, 29))
+            chuseok = date(year, 9, 8) + timedelta(days=lunar.randint(0, 29))
+            days |= {seollal + timedelta(days=i) for i in (-1, 0, 1)}
+            days |= {chuseok + timedelta(days=i) for i in (-1, 0, 1)}
+            days |= {date(year, 1, 1), date(year, 3, 1), date(year, 5, 5), date(year, 6, 6),
+                     date(year, 8, 15), date(year, 10, 3), date(year, 10, 9), date(year, 12, 25),
+                     date(year, 12, 31)}  # KRX closes on the last business day of the year
+        elif market == "US":
+            fixed = [date(year, 1, 1), date(year, 7, 4), date(year, 12, 25)]
+            if year >= 2022:
+                fixed.append(date(year, 6, 19))
+            for d in fixed:
+                # Observed on Friday / Monday when the holiday falls on a weekend
+                days.add(d - timedelta(days=1) if d.weekday() == 5 else d + timedelta(days=1) if d.weekday() == 6 else d)
+            days |= {_nth_weekday(year, 1, 0, 3), _nth_weekday(year, 2, 0, 3), _easter(year) - timedelta(days=2),
+                     _nth_weekday(year, 5, 0, -1), _nth_weekday(year, 9, 0, 1), _nth_weekday(year, 11, 3, 4)}
+        elif market == "FX":
+            # London-quoted: closed on UK bank holidays, some of which are KRX trading days
+            easter = _easter(year)
+            days |= {date(year, 1, 1), date(year, 12, 25), date(year, 12, 26), easter - timedelta(days=2),
+                     easter + timedelta(days=1), _nth_weekday(year, 5, 0, 1), _nth_weekday(year, 8, 0, -1)}
+    return days
+
+
+def _months(start: date, end: date):
+    d = start
+    while d <= end:
+        yield d
+        d = date(d.year + d.month // 12, d.month % 12 + 1, 1)
+
+
+def _synthetic_ohlcv(rng: random.Random, days: list, start: float, end: float, vol: float, mean_revert: bool) -> list:
+    rows = []
+    n = len(days)
+    drift = math.log(end / start) / n
+    log_price = math.log(start)
+    anchor = math.log(end)
+    for i, d in enumerate(days):
+        if mean_revert:
+            # FX: wander around a slowly moving anchor instead of trending
+            target = math.log(start) + (anchor - math.log(start)) * i / n
+            log_price += 0.02 * (target - log_price) + rng.gauss(0, vol)
+        else:
+            log_price += drift + rng.gauss(0, vol)
+        close = math.exp(log_price)
+        open_ = close * math.exp(rng.gauss(0, vol / 2))
+        high = max(open_, close) * (1 + abs(rng.gauss(0, vol / 2)))
+        low = min(open_, close) * (1 - abs(rng.gauss(0, vol / 2)))
+        volume = 0 if mean_revert else int(rng.lognormvariate(13, 0.5))
+        rows.append([d.isoformat(), round(open_, 4), round(high, 4), round(low, 4), round(close, 4), volume])
+    return rows
+
+
+def record_synthetic(out_dir: str) -> dict:
+    rng = random.Random(20240101)
+    manifest = {"source": "synthetic", "version": SYNTHETIC_VERSION, "recorded_at": None,
+                "as_of": SYNTHETIC_END.isoformat(), "yahoo": {}}
+
+    for symbol, spec in YAHOO_SYMBOLS.items():
+        holidays = _holidays(spec["market"], SYNTHETIC_START.year, SYNTHETIC_END.year)
+        days = list(_business_days(SYNTHETIC_START, SYNTHETIC_END, holidays))
+        rows = _synthetic_ohlcv(rng, days, spec["start"], spec["end"], spec["vol"], mean_revert=(symbol == "KRW=X"))
+        _write_csv(os.path.join(out_dir, "yahoo", f"{symbol}.csv.gz"),
+                   ["Date", "Open", "High", "Low", "Close", "Volume"], rows, compress=True)
+        manifest["yahoo"][symbol] = {"file": f"yahoo/{symbol}.csv.gz", "tz": spec["tz"]}
+
+    # FRED CPIAUCSL: ~2.5% annual inflation with noise, monthly, first of month
+    cpi_rows = []
+    value = 127.5
+    for month in _months(date(1990, 1, 1), SYNTHETIC_CPI_END):
+        cpi_rows.append([month.isoformat(), round(value, 3)])
+        value *= 1 + rng.gauss(0.0021, 0.002)
+    _write_csv(os.path.join(out_dir, "fred", "CPIAUCSL.csv"), ["Date", "Value"], cpi_rows, compress=False)
+    manifest["fred"] = {"CPIAUCSL": "fred/CPIAUCSL.csv"}
+
+    # KOSIS Korea CPI (2020=100) in the raw API shape parsed by _fetch_kosis_cpi_sync
+    kosis = []
+    value = 91.0
+    for month in _months(date(2013, 1, 1), SYNTHETIC_CPI_END):
+        kosis.append({
+            "TBL_NM": "소비자물가지수(2020=100)", "ORG_ID": "101", "TBL_ID": "DT_1J20003",
+            "ITM_NM": "총지수", "C1_NM": "전국", "PRD_SE": "M",
+            "PRD_DE": month.strftime("%Y%m"), "DT": f"{value:.2f}",
+        })
+        value *= 1 + rng.gauss(0.0018, 0.002)
+    os.makedirs(os.path.join(out_dir, "kosis"), exist_ok=True)
+    with open(os.path.join(out_dir, "kosis", "DT_1J20003.json"), "w", encoding="utf-8") as f:
+        json.dump(kosis, f, ensure_ascii=False)
+    manifest["kosis"] = {"DT_1J20003": "kosis/DT_1J20003.json"}
+
+    # KRX listing
+    prefixes = ["한국", "대한", "동양", "세방", "신성", "대성", "한일", "동아", "태평", "삼화",
+                "금강", "한양", "대림", "우진", "성도", "유니", "코스", "에이", "제이", "케이"]
+    middles = ["", "글로벌", "정밀", "첨단", "디지털", "그린", "메디", "스마트"]
+    suffixes = ["전자", "화학", "제약", "건설", "바이오", "테크", "홀딩스", "산업", "금융",
+                "에너지", "소재", "중공업", "통신", "식품", "물산"]
+    listing = [[code, name, "KOSPI", rng.randint(10**12, 5 * 10**14)] for code, name in KRX_KNOWN]
+    used_codes = {code for code, _ in KRX_KNOWN}
+    names = [p + m + s for p in prefixes for m in middles for s in suffixes]
+    rng.shuffle(names)
+    for name in names[:KRX_LISTING_SIZE - len(listing)]:
+        code = f"{rng.randint(1, 999999):06d}"
+        while code in used_codes:
+            code = f"{rng.randint(1, 999999):06d}"
+        used_codes.add(code)
+        listing.append([code, name, rng.choice(["KOSPI", "KOSDAQ", "KOSDAQ GLOBAL"]), rng.randint(10**9, 10**13)])
+    _write_csv(os.path.join(out_dir, "krx", "listing.csv.gz"), ["Code", "Name", "Market", "Marcap"], listing, compress=True)
+    manifest["krx"] = {"listing": "krx/listing.csv.gz"}
+
+    return manifest
+
+
+def record_live(out_dir: str) -> dict:
+    """Record the real upstream responses. Needs network access and FRED/KOSIS keys in .env."""
+    import httpx
+    import yfinance as yf
+    import FinanceDataReader as fdr
+    from fredapi import Fred
+    from core.config import settings
+
+    manifest = {"source": "recorded", "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), "yahoo": {}}
+
+    for symbol, spec in YAHOO_SYMBOLS.items():
+        df = yf.Ticker(symbol).history(period="max")
+        if df.empty:
+            raise RuntimeError(f"Yahoo returned no data for {symbol}")
+        tz = str(df.index.tz) if df.index.tz is not None else spec["tz"]
+        df.index = df.index.tz_localize(None).strftime("%Y-%m-%d")
+        df.index.name = "Date"
+        path = os.path.join(out_dir, "yahoo", f"{symbol}.csv.gz")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df[["Open", "High", "Low", "Close", "Volume"]].to_csv(path, compression={"method": "gzip", "mtime": 0})
+        manifest["yahoo"][symbol] = {"file": f"yahoo/{symbol}.csv.gz", "tz": tz}
+        print(f"Recorded {symbol}: {len(df)} rows")
+    manifest["as_of"] = max(
+        _last_date(os.path.join(out_dir, entry["file"])) for entry in manifest["yahoo"].values()
+    )
+
+    if not settings.FRED_API_KEY:
+        raise RuntimeError("FRED_API_KEY is required to record CPI")
+    cpi = Fred(api_key=settings.FRED_API_KEY).get_series("CPIAUCSL").dropna()
+    os.makedirs(os.path.join(out_dir, "fred"), exist_ok=True)
+    cpi.rename("Value").rename_axis("Date").to_csv(os.path.join(out_dir, "fred", "CPIAUCSL.csv"), date_format="%Y-%m-%d")
+    manifest["fred"] = {"CPIAUCSL": "fred/CPIAUCSL.csv"}
+    print(f"Recorded CPIAUCSL: {len(cpi)} rows")
+
+    if not settings.KOSIS_API_KEY:
+        raise RuntimeError("KOSIS_API_KEY is required to record KOSIS CPI")
+    params = {
+        "method": "getList", "apiKey": settings.KOSIS_API_KEY, "itmId": "T+", "objL1": "ALL",
+        "objL2": "", "objL3": "", "format": "json", "jsonVD": "Y", "prdSe": "M",
+        "startPrdDe": "201301", "endPrdDe": datetime.now().strftime("%Y%m"),
+        "orgId": "101", "tblId": "DT_1J20003",
+    }
+    resp = httpx.get("https://kosis.kr/openapi/Param/statisticsParameterData.do", params=params, timeout=30.0)
+    resp.raise_for_status()
+    os.makedirs(os.path.join(out_dir, "kosis"), exist_ok=True)
+    with open(os.path.join(out_dir, "kosis", "DT_1J20003.json"), "w", encoding="utf-8") as f:
+        json.dump(resp.json(), f, ensure_ascii=False)
+    manifest["kosis"] = {"DT_1J20003": "kosis/DT_1J20003.json"}
+    print("Recorded KOSIS DT_1J20003")
+
+    listing = fdr.StockListing("KRX")
+    path = os.path.join(out_dir, "krx", "listing.csv.gz")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    listing.to_csv(path, index=False, compression={"method": "gzip", "mtime": 0})
+    manifest["krx"] = {"listing": "krx/listing.csv.gz"}
+    print(f"Recorded KRX listing: {len(listing)} rows")
+
+    return manifest
+
+
+def _last_date(path: str) -> str:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        last = None
+        for last in f:
+            pass
+    return last.split(",", 1)[0]
+
+
+def write_fixtures(out_dir: str, synthetic: bool) -> dict:
+    manifest = record_synthetic(out_dir) if synthetic else record_live(out_dir)
+    # The manifest is written last, so a directory with a manifest is always complete.
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    return manifest
+
+
+def ensure_fixtures() -> str:
+    """
+    Return the fixture directory to use: recorded fixtures if present,
+    otherwise the synthetic set, generated on first use.
+    """
+    if os.path.isfile(os.path.join(FIXTURES_DIR, "manifest.json")):
+        return FIXTURES_DIR
+    manifest_path = os.path.join(SYNTHETIC_DIR, "manifest.json")
+    if os.path.isfile(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            if json.load(f).get("version") == SYNTHETIC_VERSION:
+                return SYNTHETIC_DIR
+    print(f"No recorded fixtures; generating synthetic fixtures in {SYNTHETIC_DIR}")
+    write_fixtures(SYNTHETIC_DIR, synthetic=True)
+    return SYNTHETIC_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", action="store_true", help="generate deterministic data instead of recording")
+    parser.add_argument("--out", help="output directory (default: benchmarks/fixtures, "
+                                      "or benchmarks/.synthetic_fixtures with --synthetic)")
+    args = parser.parse_args()
+
+    out_dir = args.out or (SYNTHETIC_DIR if args.synthetic else FIXTURES_DIR)
+    manifest = write_fixtures(out_dir, args.synthetic)
+    print(f"Fixtures written to {out_dir} (source: {manifest['source']})")
+
+
+if __name__ == "__main__":
+    main()
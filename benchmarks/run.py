@@ -0,0 +1,228 @@
+"""
+Offline benchmark & load test for the chart pipeline.
+
+    python -m benchmarks.run                          # JSON results on stdout
+    python -m benchmarks.run --output results.json    # ... or to a file
+    python -m benchmarks.run --periods 1y max --iterations 5 --skip-load
+
+Everything runs against fixtures through the fake provider, so no network is needed. Recorded
+fixtures in benchmarks/fixtures are used if present, otherwise a synthetic set is generated on first run.
+Log output from the backend (it prints a lot) is sent to stderr to keep stdout machine-readable.
+Use benchmarks/compare.py to diff two result files.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import pandas as pd
+import pydantic
+import fastapi
+
+from benchmarks.fake_provider import FixtureProvider, installed
+
+DEFAULT_PERIODS = ["5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "max"]
+DEFAULT_TICKER = "005930.KS"
+
+# Mixed traffic for the load test: numeric codes, name lookups and a non-default benchmark.
+LOAD_CASES = [
+    "/api/v1/chart/005930?period=1y",
+    "/api/v1/chart/005930?period=10y",
+    "/api/v1/chart/000660?period=5y",
+    "/api/v1/chart/삼성전자?period=max",
+    "/api/v1/chart/하이닉스?period=2y",
+    "/api/v1/chart/005930?period=1y&benchmark=S%26P500",
+    "/api/v1/chart/005930?start_date=2015-01-01&end_date=2020-12-31",
+]
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile on an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _stats_ms(samples: list) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "min_ms": round(ms[0], 4),
+        "median_ms": round(_percentile(ms, 50), 4),
+        "mean_ms": round(sum(ms) / len(ms), 4),
+        "p95_ms": round(_percentile(ms, 95), 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def time_call(fn, setup=None, iterations: int = 20, warmup: int = 2) -> dict:
+    """
+    Time fn(*setup()) `iterations` times. setup runs outside the timed region so
+    functions that mutate their inputs (calculate_real_price strips tz in place) get fresh copies.
+    """
+    setup = setup or (lambda: ())
+    for _ in range(warmup):
+        fn(*setup())
+    samples = []
+    for _ in range(iterations):
+        args = setup()
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return {"iterations": iterations, **_stats_ms(samples)}
+
+
+def run_micro(provider: FixtureProvider, periods: list, iterations: int, ticker: str = DEFAULT_TICKER) -> list:
+    from core.calculator import align_data, calculate_real_price
+    from core import stock_search
+    from core.data_loader import _fetch_kosis_cpi_sync
+    from api.v1.endpoints.chart import build_chart_response
+
+    results = []
+    cpi = provider.cpi
+
+    def record(name, period, rows, timing):
+        results.append({"name": name, "period": period, "rows": rows, **timing})
+        print(f"[micro] {name:<22} {str(period):<5} rows={rows:<6} median={timing['median_ms']:.3f}ms", file=sys.stderr)
+
+    for period in periods:
+        stock = provider.history(ticker, period)
+        fx = provider.history("KRW=X", period)
+        gold = provider.history("GC=F", period)
+        bench = provider.history("^KS11", period)
+
+        # align_data sees the tz-naive stock/FX frame that calculate_real_price builds
+        merged = pd.merge(
+            stock[["Close"]].rename(columns={"Close": "Close_KRW"}).tz_localize(None),
+            fx[["Close"]].rename(columns={"Close": "Exchange_Rate"}).tz_localize(None),
+            left_index=True, right_index=True, how="inner",
+        )
+        merged["Close_USD"] = merged["Close_KRW"] / merged["Exchange_Rate"]
+        record("align_data", period, len(merged),
+               time_call(align_data, lambda: (merged.copy(), cpi), iterations))
+
+        record("calculate_real_price", period, len(stock),
+               time_call(calculate_real_price,
+                         lambda: (stock.copy(), fx.copy(), cpi, gold.copy(), bench.copy()), iterations))
+
+        result_df = calculate_real_price(stock.copy(), fx.copy(), cpi, gold.copy(), bench.copy())
+        record("build_chart_response", period, len(result_df),
+               time_call(build_chart_response, lambda: (result_df, ticker, "삼성전자", "^KS11", period), iterations))
+
+        response = build_chart_response(result_df, ticker, "삼성전자", "^KS11", period)
+        record("response_json", period, len(result_df),
+               time_call(response.model_dump_json, iterations=iterations))
+
+    # Name search is independent of the period; the listing is loaded through the fake FDR once.
+    stock_search.load_stock_data()
+    rows = len(stock_search.stocks_listing_cache)
+    for name, fn, arg in [
+        ("search_exact", stock_search.get_ticker_from_name, "삼성전자"),
+        ("search_contains", stock_search.get_ticker_from_name, "하이닉스"),
+        ("search_miss", stock_search.get_ticker_from_name, "존재하지않는회사"),
+        ("name_from_ticker", stock_search.get_name_from_ticker, "005930.KS"),
+    ]:
+        record(name, None, rows, time_call(fn, lambda: (arg,), iterations))
+
+    record("kosis_cpi_parse", None, len(provider.kosis),
+           time_call(_fetch_kosis_cpi_sync, lambda: ("KR",), iterations))
+
+    return results
+
+
+async def _load(app, cases: list, requests: int, concurrency: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    statuses = {}
+    sem = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0) as client:
+        async def one(i: int):
+            async with sem:
+                start = time.perf_counter()
+                resp = await client.get(cases[i % len(cases)])
+                latencies.append(time.perf_counter() - start)
+                statuses[str(resp.status_code)] = statuses.get(str(resp.status_code), 0) + 1
+
+        # One untimed pass per case so first-request costs (imports, listing load) are excluded
+        for path in cases:
+            await client.get(path)
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        wall = time.perf_counter() - wall_start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "cases": cases,
+        "wall_s": round(wall, 4),
+        "throughput_rps": round(requests / wall, 3),
+        "status_counts": statuses,
+        "latency": _stats_ms(latencies),
+    }
+
+
+def run_load(requests: int, concurrency: int) -> dict:
+    from api.index import app
+    result = asyncio.run(_load(app, LOAD_CASES, requests, concurrency))
+    print(f"[load] {requests} requests @ {concurrency}: {result['throughput_rps']} req/s, "
+          f"p95={result['latency']['p95_ms']:.1f}ms, status={result['status_counts']}", file=sys.stderr)
+    return result
+
+
+def _meta(provider: FixtureProvider, args) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": {"pandas": pd.__version__, "numpy": np.__version__,
+                     "pydantic": pydantic.VERSION, "fastapi": fastapi.__version__},
+        "fixtures": {"source": provider.source, "as_of": provider.manifest.get("as_of"),
+                     "recorded_at": provider.manifest.get("recorded_at")},
+        "args": vars(args),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--periods", nargs="+", default=DEFAULT_PERIODS, help="periods for the micro-benchmarks")
+    parser.add_argument("--iterations", type=int, default=20, help="timed iterations per micro-benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="total requests in the load test")
+    parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests in the load test")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    results = {"schema": 1}
+    with redirect_stdout(sys.stderr):
+        provider = FixtureProvider()
+    with redirect_stdout(sys.stderr), installed(provider):
+        results["meta"] = _meta(provider, args)
+        results["micro"] = [] if args.skip_micro else run_micro(provider, args.periods, args.iterations)
+        results["load"] = None if args.skip_load else run_load(args.requests, args.concurrency)
+
+    payload = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from core.profiler import profile_stage
 
 def align_data(stock_df: pd.DataFrame, cpi_df: pd.Series) -> pd.DataFrame:
     """
@@ -51,6 +52,21 @@ def calculate_real_price(
     if benchmark_df is not None and benchmark_df.index.tz is not None:
         benchmark_df.index = benchmark_df.index.tz_localize(None)
         
+    with profile_stage("merge_fx"):
+        df = _merge_fx(stock_df, exchange_rate_df)
+    with profile_stage("align_cpi"):
+        df, base_cpi = _apply_cpi(df, cpi_series)
+    with profile_stage("gold"):
+        df = _apply_gold(df, gold_df)
+    with profile_stage("benchmark"):
+        df = _apply_benchmark(df, benchmark_df, base_cpi)
+
+    return df
+
+def _merge_fx(stock_df: pd.DataFrame, exchange_rate_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join stock and exchange rate closes (inner) and compute the USD price.
+    """
     # 1. Clean and Prepare Exchange Rate
     stock_df_trimmed = stock_df[['Close']].rename(columns={'Close': 'Close_KRW'})
     exchange_rate_df_trimmed = exchange_rate_df[['Close']].rename(columns={'Close': 'Exchange_Rate'})
@@ -61,7 +77,14 @@ def calculate_real_price(
     # 2. Calculate USD Price
     df['Close_USD'] = df['Close_KRW'] / df['Exchange_Rate']
     
+    return df
+
+def _apply_cpi(df: pd.DataFrame, cpi_series: pd.Series) -> tuple[pd.DataFrame, float | None]:
+    """
+    Add interpolated CPI and the CPI-adjusted Real_Price. Returns the frame and the base (latest) CPI.
+    """
     # 3. Align and Merge CPI
+    base_cpi = None
     if cpi_series.empty:
         df['Real_Price'] = np.nan
         df['CPI'] = np.nan
@@ -71,6 +94,12 @@ def calculate_real_price(
         df_with_cpi['Real_Price'] = df_with_cpi['Close_USD'] * (base_cpi / df_with_cpi['CPI'])
         df = df_with_cpi
 
+    return df, base_cpi
+
+def _apply_gold(df: pd.DataFrame, gold_df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Add the gold-denominated price (troy ounce and don).
+    """
     # 4. Calculate Gold Standard Price
     if gold_df is not None and not gold_df.empty:
         gold_df_trimmed = gold_df[['Close']].rename(columns={'Close': 'Gold_USD_oz'})
@@ -82,7 +111,13 @@ def calculate_real_price(
         df['Gold_USD_oz'] = np.nan
         df['Close_Gold_oz'] = np.nan
         df['Close_Gold_don'] = np.nan
-        
+
+    return df
+
+def _apply_benchmark(df: pd.DataFrame, benchmark_df: pd.DataFrame, base_cpi: float | None) -> pd.DataFrame:
+    """
+    Add the benchmark real price and the cumulative Alpha against it.
+    """
     # 5. Benchmark & Alpha calculation
     if benchmark_df is not None and not benchmark_df.empty:
         benchmark_close = benchmark_df[['Close']].rename(columns={'Close': 'Bench_Close'})
@@ -1,4 +1,6 @@
 from pydantic_settings import BaseSettings
+import os
+import tempfile
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "RealK API"
@@ -8,6 +10,12 @@ class Settings(BaseSettings):
     FRED_API_KEY: str | None = None
     KOSIS_API_KEY: str | None = None
     
+    # Request Profiling (off unless PROFILE_ADMIN_TOKEN is set, see core/profiler.py)
+    PROFILE_ADMIN_TOKEN: str | None = None
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_DIR: str = os.path.join(tempfile.gettempdir(), "realk_profiles")
+    PROFILE_MAX_TRACES: int = 50
+    
     model_config = {
         "env_file": ".env",
         "extra": "ignore"
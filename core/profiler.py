@@ -0,0 +1,330 @@
+"""
+Opt-in per-request profiling.
+
+A chart request is profiled when it sends X-Admin-Token: <PROFILE_ADMIN_TOKEN>, or at random
+with probability PROFILE_SAMPLE_RATE. Sampling also needs the token, because traces can only
+be read through the admin routes it protects.
+
+Code inside `profile_stage(...)` blocks is recorded for one request: wall time and
+allocation deltas (tracemalloc) for every stage, and a cProfile trace. The trace is written
+to a bounded on-disk ring buffer (`trace_store`) as a pstats `.prof` file plus a JSON summary.
+
+Isolation from other requests: cProfile and tracemalloc run only inside synchronous stages
+(calculate, format, serialize, ...). No other coroutine can run on the event loop there, so the
+trace holds only this request's work, and unprofiled requests pay nothing while the profiled one
+awaits. Stages that await (`awaits=True`, the fetches) record wall time only. That wall time
+includes whatever other coroutines ran on the loop meanwhile.
+
+When no request is being profiled, `profile_stage` hands back a shared no-op context manager,
+so the markers left in the hot path cost a ContextVar lookup.
+
+Caveats:
+- Executor threads (the yfinance / FRED fetches) are never in the cProfile trace.
+- tracemalloc is process-wide. Allocation numbers for a stage include allocations made by
+  executor threads of other requests during that stage, and those threads run slower while a
+  stage is being traced.
+- A profiled request's synchronous stages run several times slower and block the event loop,
+  delaying other requests on the same worker. Keep PROFILE_SAMPLE_RATE low.
+- Only one request is profiled at a time; others that would be profiled run normally.
+"""
+import cProfile
+import contextvars
+import json
+import os
+import pstats
+import random
+import re
+import secrets
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+from core.config import settings
+
+ADMIN_HEADER = "X-Admin-Token"
+TOP_FUNCTIONS = 30
+
+_current_profile = contextvars.ContextVar("realk_request_profile", default=None)
+_profiling_lock = threading.Lock()
+_NO_PROFILE = nullcontext()
+_TRACE_ID_RE = re.compile(r"^\d{13}-[0-9a-f]{8}$")
+
+if settings.PROFILE_SAMPLE_RATE > 0 and not settings.PROFILE_ADMIN_TOKEN:
+    print("Warning: PROFILE_SAMPLE_RATE is ignored because PROFILE_ADMIN_TOKEN is not set.")
+
+
+def is_admin_token(token: str | None) -> bool:
+    """Check a token against PROFILE_ADMIN_TOKEN. Always False when no token is configured."""
+    if not settings.PROFILE_ADMIN_TOKEN or not token:
+        return False
+    return secrets.compare_digest(token, settings.PROFILE_ADMIN_TOKEN)
+
+
+def profiling_trigger(headers) -> str | None:
+    """
+    Decide whether a request should be profiled.
+    Returns 'header' or 'sampled', or None (the common case) to run without profiling.
+    """
+    if not settings.PROFILE_ADMIN_TOKEN:
+        return None
+    if is_admin_token(headers.get(ADMIN_HEADER)):
+        return "header"
+    if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def current_profile():
+    return _current_profile.get()
+
+
+def profile_stage(name: str, awaits: bool = False):
+    """
+    Mark a stage of the current request. No-op unless the request is being profiled.
+    Pass awaits=True for stages that await: they get wall time only (see module docstring).
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return _NO_PROFILE
+    return profile.stage(name, awaits)
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    # Snapshots allocate while tracing; drop those blocks so they are not counted as the stage's
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+class RequestProfile:
+    """cProfile trace plus per-stage timings and allocation counts for one request."""
+
+    def __init__(self, trigger: str, path: str, query: str):
+        self.id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        self.trigger = trigger
+        self.path = path
+        self.query = query
+        self.stages = []
+        self.profiler = cProfile.Profile()
+        self._stack = []
+        self._traced_depth = 0
+        self._token = None
+        self._owns_tracemalloc = False
+
+    def start(self):
+        self._token = _current_profile.set(self)
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+
+    def stop(self):
+        # A stage opened with begin_stage() (serialize) is still open when the handler returns
+        while self._stack:
+            self.end_stage()
+        self.total_ms = (time.perf_counter() - self._t0) * 1000
+        _current_profile.reset(self._token)
+
+    def begin_stage(self, name: str, awaits: bool = False):
+        """Open a stage; close it with end_stage(). Nested stages are recorded as 'outer/inner'."""
+        traced = not awaits and (not self._stack or self._stack[-1]["traced"])
+        if traced and self._traced_depth == 0:
+            # Outermost synchronous stage: switch the tracers on for its duration only
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owns_tracemalloc = True
+            self.profiler.enable()
+        if traced:
+            self._traced_depth += 1
+            # reset_peak() is global, so fold the current peak into the enclosing stage first
+            if self._stack and self._stack[-1]["traced"]:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+            with self._untraced():
+                snapshot = _take_snapshot()
+            size_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        else:
+            snapshot = None
+            size_before = 0
+        self._stack.append({
+            "name": "/".join([f["name"] for f in self._stack] + [name]),
+            "traced": traced,
+            "peak": size_before,
+            "size_before": size_before,
+            "snapshot": snapshot,
+            "start": time.perf_counter(),
+        })
+
+    def end_stage(self):
+        end = time.perf_counter()
+        frame = self._stack.pop()
+        record = {
+            "name": frame["name"],
+            "profiled": frame["traced"],
+            "start_ms": round((frame["start"] - self._t0) * 1000, 3),
+            "wall_ms": round((end - frame["start"]) * 1000, 3),
+        }
+        if frame["traced"]:
+            size_after, peak = tracemalloc.get_traced_memory()
+            peak = max(frame["peak"], peak)
+            if self._stack and self._stack[-1]["traced"]:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            # Blocks allocated in the stage and still alive at its end, counted per source line so
+            # memory freed during the stage cannot offset them. Short-lived allocations show in peak_bytes.
+            with self._untraced():
+                diff = _take_snapshot().compare_to(frame["snapshot"], "lineno")
+                alloc_blocks = sum(stat.count_diff for stat in diff if stat.count_diff > 0)
+            # The snapshots raised the peak; the enclosing stage already has this stage's real peak
+            tracemalloc.reset_peak()
+            record.update({
+                "alloc_blocks": alloc_blocks,
+                "alloc_bytes": size_after - frame["size_before"],
+                "peak_bytes": peak - frame["size_before"],
+            })
+            self._traced_depth -= 1
+            if self._traced_depth == 0:
+                self.profiler.disable()
+                if self._owns_tracemalloc:
+                    tracemalloc.stop()
+                    self._owns_tracemalloc = False
+        self.stages.append(record)
+
+    @contextmanager
+    def _untraced(self):
+        """Keep the profiler's own bookkeeping (snapshots) out of the cProfile trace."""
+        self.profiler.disable()
+        try:
+            yield
+        finally:
+            self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name: str, awaits: bool = False):
+        self.begin_stage(name, awaits)
+        try:
+            yield
+        finally:
+            self.end_stage()
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> list:
+        if not any(s["profiled"] for s in self.stages):
+            return []
+        stats = pstats.Stats(self.profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [
+            {
+                "function": f"{filename}:{line}({func})",
+                "ncalls": ncalls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+            for (filename, line, func), (_, ncalls, tottime, cumtime, _) in rows
+        ]
+
+    def summary(self, status_code: int) -> dict:
+        top_level = [s for s in self.stages if "/" not in s["name"]]
+        return {
+            "id": self.id,
+            "trigger": self.trigger,
+            "path": self.path,
+            "query": self.query,
+            "status_code": status_code,
+            "started_at": self.started_at.isoformat(timespec="milliseconds"),
+            "total_ms": round(self.total_ms, 3),
+            # Time outside any stage (routing, dependency solving, ...)
+            "unstaged_ms": round(self.total_ms - sum(s["wall_ms"] for s in top_level), 3),
+            "stages": sorted(self.stages, key=lambda s: s["start_ms"]),
+            "top_functions": self.top_functions(),
+        }
+
+
+def start_profile(trigger: str, path: str, query: str) -> RequestProfile | None:
+    """Begin profiling the current request, or return None if another request is already profiled."""
+    if not _profiling_lock.acquire(blocking=False):
+        print(f"Profiling skipped for {path}: another request is being profiled.")
+        return None
+    profile = RequestProfile(trigger, path, query)
+    try:
+        profile.start()
+    except Exception:
+        _profiling_lock.release()
+        raise
+    return profile
+
+
+def finish_profile(profile: RequestProfile, status_code: int) -> dict:
+    try:
+        profile.stop()
+    finally:
+        _profiling_lock.release()
+    return profile.summary(status_code)
+
+
+class TraceStore:
+    """
+    Bounded on-disk ring buffer of traces: <id>.prof (pstats) and <id>.json (summary).
+    Ids start with a millisecond timestamp, so sorting by name is sorting by age.
+    """
+
+    def __init__(self, directory: str, max_traces: int):
+        self.directory = directory
+        self.max_traces = max_traces
+        self._lock = threading.Lock()
+
+    def _path(self, trace_id: str, ext: str) -> str | None:
+        if not _TRACE_ID_RE.match(trace_id):
+            return None
+        return os.path.join(self.directory, f"{trace_id}.{ext}")
+
+    def _ids(self) -> list:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.directory)
+                      if name.endswith(".json") and _TRACE_ID_RE.match(name[:-5]))
+
+    def save(self, profile: RequestProfile, summary: dict):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            prof_path = self._path(profile.id, "prof")
+            json_path = self._path(profile.id, "json")
+            profile.profiler.dump_stats(prof_path + ".tmp")
+            os.replace(prof_path + ".tmp", prof_path)
+            # The JSON is written last: a trace is listed only once both files exist.
+            with open(json_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False)
+            os.replace(json_path + ".tmp", json_path)
+
+            ids = self._ids()
+            for old_id in ids[:max(0, len(ids) - self.max_traces)]:
+                for ext in ("json", "prof"):
+                    try:
+                        os.remove(self._path(old_id, ext))
+                    except FileNotFoundError:
+                        pass
+
+    def list(self) -> list:
+        """Summaries without the function table, newest first."""
+        traces = []
+        for trace_id in reversed(self._ids()):
+            summary = self.get(trace_id)
+            if summary is not None:
+                summary.pop("top_functions", None)
+                traces.append(summary)
+        return traces
+
+    def get(self, trace_id: str) -> dict | None:
+        path = self._path(trace_id, "json")
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            # Pruned between listing and reading
+            return None
+
+    def prof_path(self, trace_id: str) -> str | None:
+        path = self._path(trace_id, "prof")
+        return path if path and os.path.isfile(path) else None
+
+
+trace_store = TraceStore(settings.PROFILE_DIR, settings.PROFILE_MAX_TRACES)
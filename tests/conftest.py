@@ -0,0 +1,40 @@
+import asyncio
+
+import httpx
+import pytest
+
+from benchmarks.fake_provider import FixtureProvider, installed
+from core.config import settings
+from core.profiler import trace_store
+
+TOKEN = "test-admin-token"
+
+
+@pytest.fixture(scope="session")
+def provider():
+    return FixtureProvider()
+
+
+@pytest.fixture
+def profiling(monkeypatch, tmp_path, provider):
+    """Profiling enabled with a known token and a temporary trace directory; upstreams faked."""
+    monkeypatch.setattr(settings, "PROFILE_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(trace_store, "directory", str(tmp_path))
+    monkeypatch.setattr(trace_store, "max_traces", 50)
+    with installed(provider):
+        yield trace_store
+
+
+@pytest.fixture
+def fetch():
+    """Run requests against the app (or `app=`) in-process: fetch(*(path, headers)) -> list of responses."""
+    from api.index import app as default_app
+
+    def run(*requests, app=None):
+        async def go():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app or default_app), base_url="http://test") as client:
+                return await asyncio.gather(*(client.get(path, headers=headers or {}) for path, headers in requests))
+        return asyncio.run(go())
+
+    return run
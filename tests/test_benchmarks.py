@@ -0,0 +1,110 @@
+import math
+
+import pandas as pd
+import pytest
+
+from benchmarks.compare import compare
+
+
+def results(micro=None, p95=100.0, rps=50.0):
+    micro = {"align_data": 10.0} if micro is None else micro
+    return {
+        "micro": [{"name": name, "period": "1y", "median_ms": ms} for name, ms in micro.items()],
+        "load": None if p95 is None else {"latency": {"p95_ms": p95}, "throughput_rps": rps},
+    }
+
+
+def by_name(rows):
+    return {name: (old, new, change, regressed) for name, old, new, change, regressed in rows}
+
+
+def test_compare_unchanged_results_pass():
+    rows = compare(results(), results(), 0.15)
+    assert set(by_name(rows)) == {"align_data[1y] median_ms", "load p95_ms", "load throughput_rps"}
+    assert not any(r[4] for r in rows)
+
+
+def test_compare_threshold_boundary():
+    # 0.25 is exact in binary floating point, so the boundary case is really at the threshold
+    rows = by_name(compare(results({"a": 100.0, "b": 100.0}), results({"a": 125.0, "b": 126.0}), 0.25))
+    assert rows["a[1y] median_ms"][2] == 0.25
+    # Exactly at the threshold is allowed, beyond it is a regression
+    assert rows["a[1y] median_ms"][3] is False
+    assert rows["b[1y] median_ms"][3] is True
+
+
+def test_compare_throughput_drop_is_regression():
+    rows = by_name(compare(results(rps=100.0), results(rps=80.0), 0.15))
+    assert rows["load throughput_rps"][2] == pytest.approx(-0.2)
+    assert rows["load throughput_rps"][3] is True
+
+    rows = by_name(compare(results(rps=100.0), results(rps=150.0), 0.15))
+    assert rows["load throughput_rps"][3] is False
+
+
+def test_compare_latency_drop_is_not_regression():
+    rows = by_name(compare(results(p95=100.0), results(p95=50.0), 0.15))
+    assert rows["load p95_ms"][3] is False
+
+
+def test_compare_reports_missing_metrics():
+    # A renamed benchmark and a run with --skip-load
+    rows = by_name(compare(results({"align_data": 10.0}), results({"align": 10.0}, p95=None), 0.15))
+    assert rows["align_data[1y] median_ms"] == (10.0, None, None, True)
+    assert rows["align[1y] median_ms"] == (None, 10.0, None, True)
+    assert rows["load p95_ms"] == (100.0, None, None, True)
+    assert rows["load throughput_rps"] == (50.0, None, None, True)
+
+
+def test_compare_zero_baseline():
+    rows = by_name(compare(results({"a": 0.0, "b": 0.0}), results({"a": 0.0, "b": 1.0}, rps=10.0), 0.15))
+    assert rows["a[1y] median_ms"][2:] == (0.0, False)
+    assert rows["b[1y] median_ms"][2:] == (math.inf, True)
+
+    rows = by_name(compare(results(rps=0.0), results(rps=10.0), 0.15))
+    assert rows["load throughput_rps"][3] is False
+
+
+def test_history_is_tz_localized(provider):
+    df = provider.history("005930.KS", "max")
+    assert str(df.index.tz) == "Asia/Seoul"
+    assert str(provider.history("GC=F", "1y").index.tz) == "America/New_York"
+
+
+def test_history_end_is_exclusive(provider):
+    full = provider.history("005930.KS", "max")
+    start, end = full.index[100], full.index[110]
+    df = provider.history("005930.KS", start=start.strftime("%Y-%m-%d"), end=end.strftime("%Y-%m-%d"))
+    assert df.index[0] == start
+    assert df.index[-1] == full.index[109]
+    assert len(df) == 10
+
+
+def test_history_periods(provider):
+    full = provider.history("005930.KS", "max")
+    last = full.index[-1]
+
+    assert len(provider.history("005930.KS", "5d")) == 5
+    assert provider.history("005930.KS", "5d").index[-1] == last
+
+    ytd = provider.history("005930.KS", "ytd")
+    assert ytd.index[0].year == last.year
+    assert full[full.index < ytd.index[0]].index[-1].year == last.year - 1
+
+    one_year = provider.history("005930.KS", "1y")
+    assert one_year.index[0] >= last.normalize() - pd.DateOffset(years=1)
+    assert len(one_year) < len(full)
+
+    pd.testing.assert_frame_equal(full, provider.histories["005930.KS"])
+
+
+def test_history_returns_copies(provider):
+    df = provider.history("005930.KS", "5d")
+    df["Close"] = 0.0
+    assert (provider.history("005930.KS", "5d")["Close"] != 0.0).all()
+
+
+def test_history_unknown_symbol_or_period_is_empty(provider):
+    assert provider.history("NOPE_XYZ", "1y").empty
+    assert provider.history("NOPE_XYZ", start="2020-01-01").empty
+    assert provider.history("005930.KS", "7w").empty
@@ -0,0 +1,144 @@
+import os
+import pstats
+
+from fastapi import APIRouter, FastAPI
+
+from api.v1.profiling import ProfiledRoute
+from core import profiler
+from core.config import settings
+from core.profiler import ADMIN_HEADER, profiling_trigger, start_profile, finish_profile
+from tests.conftest import TOKEN
+
+ADMIN = {ADMIN_HEADER: TOKEN}
+CHART = "/api/v1/chart/005930?period=1y"
+
+
+def test_unprofiled_request_has_no_trace(profiling, fetch):
+    [resp] = fetch((CHART, None))
+    assert resp.status_code == 200
+    assert "x-profile-id" not in resp.headers
+    assert profiling.list() == []
+
+
+def test_profiled_request_records_stages(profiling, fetch):
+    [resp] = fetch((CHART, ADMIN))
+    assert resp.status_code == 200
+    profile_id = resp.headers["x-profile-id"]
+
+    [summary, download] = fetch((f"/api/v1/admin/profiles/{profile_id}", ADMIN),
+                                (f"/api/v1/admin/profiles/{profile_id}/download", ADMIN))
+    summary = summary.json()
+    assert summary["trigger"] == "header"
+    assert summary["status_code"] == 200
+    stages = {s["name"]: s for s in summary["stages"]}
+    for name in ["resolve_ticker", "fetch_essential", "fetch_optional", "calculate",
+                 "calculate/merge_fx", "calculate/align_cpi", "format", "serialize"]:
+        assert name in stages
+    assert stages["fetch_essential"]["profiled"] is False
+    # format builds the response objects, so it must allocate; no stage can allocate a negative amount
+    assert stages["format"]["alloc_blocks"] > 0
+    assert all(s["alloc_blocks"] >= 0 and s["peak_bytes"] >= 0 for s in summary["stages"] if s["profiled"])
+    assert summary["top_functions"]
+
+    assert download.status_code == 200
+    assert download.content == open(profiling.prof_path(profile_id), "rb").read()
+
+
+def test_trace_excludes_concurrent_requests(profiling, fetch):
+    responses = fetch(("/api/v1/chart/005930?period=max", ADMIN),
+                      *[("/api/v1/chart/000660?period=5d", None)] * 8)
+    assert [r.status_code for r in responses] == [200] * 9
+    assert all("x-profile-id" not in r.headers for r in responses[1:])
+
+    stats = pstats.Stats(profiling.prof_path(responses[0].headers["x-profile-id"])).stats
+    ncalls = {func: calls for (_, _, func), (_, calls, _, _, _) in stats.items()}
+    assert ncalls["calculate_real_price"] == 1
+    assert ncalls["build_chart_response"] == 1
+
+
+def test_ring_buffer_keeps_max_traces(profiling, fetch, monkeypatch):
+    monkeypatch.setattr(profiling, "max_traces", 2)
+    ids = [fetch((CHART, ADMIN))[0].headers["x-profile-id"] for _ in range(4)]
+
+    [resp] = fetch(("/api/v1/admin/profiles", ADMIN))
+    assert [p["id"] for p in resp.json()["profiles"]] == ids[:1:-1]
+    assert sorted(os.listdir(profiling.directory)) == sorted(f"{i}.{ext}" for i in ids[2:] for ext in ("json", "prof"))
+
+
+def test_admin_routes_hidden_without_token(profiling, fetch, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_ADMIN_TOKEN", None)
+    [listing, chart] = fetch(("/api/v1/admin/profiles", ADMIN), (CHART, ADMIN))
+    assert listing.status_code == 404
+    assert "x-profile-id" not in chart.headers
+
+
+def test_admin_routes_reject_wrong_token(profiling, fetch):
+    [missing, wrong, chart] = fetch(("/api/v1/admin/profiles", None),
+                                    ("/api/v1/admin/profiles", {ADMIN_HEADER: "wrong"}),
+                                    (CHART, {ADMIN_HEADER: "wrong"}))
+    assert missing.status_code == 403
+    assert wrong.status_code == 403
+    assert "x-profile-id" not in chart.headers
+
+
+def test_trace_id_path_guard(profiling, fetch):
+    # A file one level above the trace directory must not be reachable
+    with open(os.path.join(os.path.dirname(profiling.directory), "secret.json"), "w") as f:
+        f.write("{}")
+    [traversal, download] = fetch(("/api/v1/admin/profiles/..%2F..%2Fsecret", ADMIN),
+                                  ("/api/v1/admin/profiles/..%2Fsecret/download", ADMIN))
+    assert traversal.status_code == 404
+    assert download.status_code == 404
+    assert profiling.get("../secret") is None
+    assert profiling.prof_path("../secret") is None
+
+
+def test_profiling_trigger(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    assert profiling_trigger(ADMIN) == "header"
+    assert profiling_trigger({ADMIN_HEADER: "wrong"}) is None
+    assert profiling_trigger({}) is None
+
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+    assert profiling_trigger({}) == "sampled"
+
+    # Sampling without a token would write traces nobody can read
+    monkeypatch.setattr(settings, "PROFILE_ADMIN_TOKEN", None)
+    assert profiling_trigger({}) is None
+    assert profiling_trigger(ADMIN) is None
+
+
+def test_one_profile_at_a_time():
+    first = start_profile("header", "/a", "")
+    try:
+        assert first is not None
+        assert start_profile("header", "/b", "") is None
+    finally:
+        finish_profile(first, 200)
+    second = start_profile("header", "/c", "")
+    assert second is not None
+    finish_profile(second, 200)
+    assert not profiler._profiling_lock.locked()
+
+
+def test_failed_request_returns_profile_id(profiling, fetch):
+    [resp] = fetch(("/api/v1/chart/NOPE_XYZ", ADMIN))
+    assert resp.status_code == 500
+    profile_id = resp.headers["x-profile-id"]
+    assert profiling.get(profile_id)["status_code"] == 500
+
+
+def test_validation_error_status_recorded(profiling, fetch):
+    router = APIRouter(route_class=ProfiledRoute)
+
+    @router.get("/items")
+    async def items(n: int):
+        return {"n": n}
+
+    app = FastAPI()
+    app.include_router(router)
+    [resp] = fetch(("/items?n=abc", ADMIN), app=app)
+    assert resp.status_code == 422
+    [summary] = profiling.list()
+    assert summary["status_code"] == 422